@@ -13,14 +13,125 @@ Example:
 """
 
 import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import itertools
+import multiprocessing as mp
 import os
 import sys
 import time
+import traceback
 import json
+import numpy as np
 from datetime import datetime
 from typing import List, Dict, Tuple
 from waypoint_eecbs import WaypointEECBSRunner
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson's C encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    # ensure_ascii=False skips the per-character ASCII escaping pass and
+    # matches orjson's UTF-8 output
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def _available_maps() -> frozenset:
+    """Names of the maps present in data/maps, scanned once per process."""
+    try:
+        return frozenset(
+            e.name[:-4] for e in os.scandir("data/maps") if e.name.endswith(".map")
+        )
+    except FileNotFoundError:
+        return frozenset()
+
+
+@functools.lru_cache(maxsize=None)
+def _available_scenario_files(map_name: str) -> frozenset:
+    """Paths of all .scen files under data/scenarios/<map_name>, scanned once."""
+    found = set()
+    try:
+        for sub in os.scandir(f"data/scenarios/{map_name}"):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".scen"):
+                    found.add(f"{sub.path}/{entry.name}")
+    except FileNotFoundError:
+        pass
+    return frozenset(found)
+
+
+# One BatchWaypointRunner per worker process, created by _init_worker so the
+# underlying WaypointEECBSRunner is built once per worker, not once per job
+_WORKER_RUNNER = None
+
+
+def _init_worker(base_output_dir: str):
+    """Pool initializer: set up the per-process batch runner."""
+    global _WORKER_RUNNER
+    _WORKER_RUNNER = BatchWaypointRunner(base_output_dir=base_output_dir)
+
+
+def _execute_scenario(runner: WaypointEECBSRunner, map_file: str, scenario_path: str,
+                      output_dir: str, num_agents: int, timeout: int,
+                      suboptimality: float) -> Dict:
+    """Core workflow for one experiment: run EECBS on a (map, scenario) pair.
+
+    Shared by every entry point so there is a single hot code path;
+    class-specific logging and result enrichment happen around this call,
+    not inside it.
+    """
+    start_time = time.time()
+    result = runner.run_waypoint_scenario(
+        map_file=map_file,
+        scenario_file=scenario_path,
+        scenario_index=0,  # Use first scenario
+        num_agents=num_agents,
+        timeout=timeout,
+        suboptimality=suboptimality,
+        output_dir=output_dir
+    )
+    result['run_time'] = time.time() - start_time
+    return result
+
+
+def _run_one(job: Tuple) -> Tuple[Dict, str]:
+    """Run a single batch job in a worker process.
+
+    Must be a module-level function so it can be pickled by multiprocessing.
+    The job's stdout is captured into a buffer and returned alongside the
+    result, so concurrent workers never interleave writes to the terminal.
+    """
+    (map_name, scenario_name, scenario_file, map_file, scenario_path,
+     num_agents, timeout, suboptimality, base_output_dir, batch_ts, run_index) = job
+
+    runner = _WORKER_RUNNER or BatchWaypointRunner(base_output_dir=base_output_dir)
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        result = runner.run_scenario(
+            map_name=map_name,
+            scenario_name=scenario_name,
+            scenario_file=scenario_file,
+            num_agents=num_agents,
+            timeout=timeout,
+            suboptimality=suboptimality,
+            batch_ts=batch_ts,
+            run_index=run_index,
+            map_file=map_file,
+            scenario_path=scenario_path
+        )
+    return result, buf.getvalue()
+
 
 class BatchWaypointRunner:
     """Batch runner for waypoint EECBS scenarios."""
@@ -28,42 +139,48 @@ class BatchWaypointRunner:
     def __init__(self, base_output_dir: str = "batch_results"):
         self.base_output_dir = base_output_dir
         self.results = []
-        
+
+        # One EECBS runner for all scenarios; it holds no per-scenario state
+        self._eecbs = WaypointEECBSRunner()
+
+        # Batch-level timestamp plus a monotonic counter: second-resolution
+        # timestamps alone can collide between parallel workers
+        self._batch_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._ctr = itertools.count()
+
         # Ensure output directory exists
         os.makedirs(base_output_dir, exist_ok=True)
     
-    def run_scenario(self, map_name: str, scenario_name: str, scenario_file: str, num_agents: int, 
-                    timeout: int, suboptimality: float = 1.2) -> Dict:
-        """Run a single scenario and return results."""
-        
+    def run_scenario(self, map_name: str, scenario_name: str, scenario_file: str, num_agents: int,
+                    timeout: int, suboptimality: float = 1.2,
+                    batch_ts: str = None, run_index: int = None,
+                    map_file: str = None, scenario_path: str = None) -> Dict:
+        """Run a single scenario and return results.
+
+        batch_ts is the timestamp of the enclosing batch; combined with
+        run_index it keeps output directories unique without formatting a
+        fresh datetime per scenario. map_file and scenario_path are the
+        paths precomputed by run_batch; they are only rebuilt here when the
+        method is called directly.
+        """
+
         print(f"DEBUG: Starting scenario: {map_name} - {scenario_name} - {scenario_file}")
-        
-        # Construct file paths for new structure
-        map_file = f"data/maps/{map_name}.map"
-        scenario_file_path = f"data/scenarios/{map_name}/{map_name}_{scenario_name}/{map_name}-{scenario_file}.scen"
-        
+
+        if map_file is None:
+            map_file = f"data/maps/{map_name}.map"
+        if scenario_path is None:
+            scenario_path = (f"data/scenarios/{map_name}/{map_name}_{scenario_name}/"
+                             f"{map_name}-{scenario_file}.scen")
+
         print(f"DEBUG: Map file: {map_file}")
-        print(f"DEBUG: Scenario file: {scenario_file_path}")
-        
-        # Check if files exist
-        if not os.path.exists(map_file):
-            print(f"ERROR: Map file not found: {map_file}")
-            return {
-                'success': False,
-                'error': f"Map file not found: {map_file}"
-            }
-        
-        if not os.path.exists(scenario_file_path):
-            print(f"ERROR: Scenario file not found: {scenario_file_path}")
-            return {
-                'success': False,
-                'error': f"Scenario file not found: {scenario_file_path}"
-            }
-        
-        print(f"DEBUG: Both files exist, proceeding...")
-        
+        print(f"DEBUG: Scenario file: {scenario_path}")
+
         # Create output directory for this run
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if batch_ts is None:
+            batch_ts = self._batch_ts
+        if run_index is None:
+            run_index = next(self._ctr)
+        timestamp = f"{batch_ts}_{run_index:04d}"
         output_dir = f"{self.base_output_dir}/{map_name}_{scenario_name}_{scenario_file}_{num_agents}agents_{timestamp}"
         
         print(f"Running: {map_name} - {scenario_name} - {scenario_file} with {num_agents} agents")
@@ -72,36 +189,34 @@ class BatchWaypointRunner:
         # Run the scenario
         start_time = time.time()
         try:
-            print(f"DEBUG: Creating WaypointEECBSRunner...")
-            runner = WaypointEECBSRunner()
             print(f"DEBUG: Calling run_waypoint_scenario...")
-            result = runner.run_waypoint_scenario(
-                map_file=map_file,
-                scenario_file=scenario_file_path,
-                scenario_index=0,  # Use first scenario
-                num_agents=num_agents,
-                timeout=timeout,
-                suboptimality=suboptimality,
-                output_dir=output_dir
+            result = _execute_scenario(
+                self._eecbs, map_file, scenario_path, output_dir,
+                num_agents, timeout, suboptimality
             )
-            
+
             result['map_name'] = map_name
             result['scenario_name'] = scenario_name
+            result['scenario_file'] = scenario_file
             result['num_agents'] = num_agents
             result['timeout'] = timeout
             result['suboptimality'] = suboptimality
             result['output_dir'] = output_dir
-            result['run_time'] = time.time() - start_time
             result['timestamp'] = timestamp
-            
+
             return result
-            
+
         except Exception as e:
+            # Format the traceback once; walking and rendering the frame
+            # stack is not free
+            tb = traceback.format_exc()
             return {
                 'success': False,
                 'error': f"Exception during run: {str(e)}",
+                'traceback': tb,
                 'map_name': map_name,
                 'scenario_name': scenario_name,
+                'scenario_file': scenario_file,
                 'num_agents': num_agents,
                 'timeout': timeout,
                 'suboptimality': suboptimality,
@@ -110,10 +225,17 @@ class BatchWaypointRunner:
                 'timestamp': timestamp
             }
     
-    def run_batch(self, maps: List[str], scenarios: List[str], scenario_files: List[str], 
-                  num_agents: int, timeout: int, suboptimality: float = 1.2) -> List[Dict]:
-        """Run multiple scenarios in batch."""
-        
+    def run_batch(self, maps: List[str], scenarios: List[str], scenario_files: List[str],
+                  num_agents: int, timeout: int, suboptimality: float = 1.2,
+                  workers: int = None) -> List[Dict]:
+        """Run multiple scenarios in batch.
+
+        Each (map, scenario, scenario_file) combination launches an independent
+        ./eecbs process, so the jobs are dispatched to a multiprocessing pool
+        instead of being run one at a time. Results are collected (and printed)
+        as soon as each job finishes via imap_unordered.
+        """
+
         print(f"Starting batch run:")
         print(f"  Maps: {maps}")
         print(f"  Scenarios: {scenarios}")
@@ -123,51 +245,109 @@ class BatchWaypointRunner:
         print(f"  Suboptimality: {suboptimality}")
         print(f"  Output directory: {self.base_output_dir}")
         print("-" * 60)
-        
-        results = []
-        
+
+        # One timestamp for the whole batch; each job gets an index so
+        # output directories stay unique without per-scenario datetime calls
+        batch_ts = self._batch_ts
+
+        # Flatten the Cartesian product into picklable job tuples, checking
+        # map and scenario-dir existence once at the level it applies to
+        # instead of once per innermost iteration
+        jobs = []
+        map_files = {map_name: f"data/maps/{map_name}.map" for map_name in maps}
         for map_name in maps:
+            if map_name not in _available_maps():
+                print(f"Skipping {map_name}: {map_files[map_name]} not found")
+                continue
+            available = _available_scenario_files(map_name)
+            available_dirs = {path.rsplit('/', 1)[0] for path in available}
             for scenario_name in scenarios:
+                scenario_dir = f"data/scenarios/{map_name}/{map_name}_{scenario_name}"
+                if scenario_dir not in available_dirs:
+                    print(f"Skipping {map_name} - {scenario_name}: {scenario_dir} not found")
+                    continue
                 for scenario_file in scenario_files:
-                    result = self.run_scenario(
-                        map_name=map_name,
-                        scenario_name=scenario_name,
-                        scenario_file=scenario_file,
-                        num_agents=num_agents,
-                        timeout=timeout,
-                        suboptimality=suboptimality
-                    )
-                    
+                    scenario_path = f"{scenario_dir}/{map_name}-{scenario_file}.scen"
+                    if scenario_path not in available:
+                        print(f"Skipping {map_name} - {scenario_name} - {scenario_file}: "
+                              f"{scenario_path} not found")
+                        continue
+                    jobs.append((map_name, scenario_name, scenario_file,
+                                 map_files[map_name], scenario_path, num_agents,
+                                 timeout, suboptimality, self.base_output_dir,
+                                 batch_ts, len(jobs)))
+
+        if workers is None:
+            workers = mp.cpu_count()
+        workers = min(len(jobs), workers)
+
+        results = []
+
+        if workers <= 1:
+            # Serial fallback (single job or explicitly requested)
+            _init_worker(self.base_output_dir)
+            for job in jobs:
+                result, captured = _run_one(job)
+                sys.stdout.write(captured)
+                results.append(result)
+                self._print_summary(result)
+        else:
+            # fork avoids respawn overhead and keeps workers cheap on the
+            # Linux/HPRC target; fall back to the platform default elsewhere
+            try:
+                ctx = mp.get_context('fork')
+            except ValueError:
+                ctx = mp
+            with ctx.Pool(processes=workers, initializer=_init_worker,
+                          initargs=(self.base_output_dir,)) as pool:
+                for result, captured in pool.imap_unordered(_run_one, jobs):
+                    # One atomic write of the worker's whole transcript
+                    sys.stdout.write(captured)
                     results.append(result)
-                    
-                    # Print result summary
-                    if result['success']:
-                        print(f"✅ SUCCESS: {map_name} - {scenario_name} - {scenario_file}")
-                        if 'total_cost' in result:
-                            print(f"   Total Cost: {result['total_cost']}")
-                        if 'total_path_length' in result:
-                            print(f"   Path Length: {result['total_path_length']}")
-                        if 'run_time' in result:
-                            print(f"   Run Time: {result['run_time']:.2f}s")
-                    else:
-                        print(f"❌ FAILED: {map_name} - {scenario_name} - {scenario_file}")
-                        print(f"   Error: {result.get('error', 'Unknown error')}")
-                    
-                    print()
-        
+                    self._print_summary(result)
+
         # Save batch results
-        self.save_batch_results(results)
-        
+        asyncio.run(self.save_batch_results(results))
+
         return results
+
+    def _emit(self, lines: List[str]):
+        """Write a block of output lines with a single stdout call."""
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    def _print_summary(self, result: Dict):
+        """Print a short summary for a completed scenario."""
+        map_name = result.get('map_name', '?')
+        scenario_name = result.get('scenario_name', '?')
+        scenario_file = result.get('scenario_file', '?')
+
+        if result['success']:
+            lines = [f"✅ SUCCESS: {map_name} - {scenario_name} - {scenario_file}"]
+            if 'total_cost' in result:
+                lines.append(f"   Total Cost: {result['total_cost']}")
+            if 'total_path_length' in result:
+                lines.append(f"   Path Length: {result['total_path_length']}")
+            if 'run_time' in result:
+                lines.append(f"   Run Time: {result['run_time']:.2f}s")
+        else:
+            lines = [f"❌ FAILED: {map_name} - {scenario_name} - {scenario_file}",
+                     f"   Error: {result.get('error', 'Unknown error')}"]
+
+        lines.append('')
+        self._emit(lines)
     
-    def save_batch_results(self, results: List[Dict]):
-        """Save batch results to JSON file."""
+    async def save_batch_results(self, results: List[Dict]):
+        """Save batch results to JSON file.
+
+        The serialization and write happen in a worker thread via
+        asyncio.to_thread so the caller is free to keep running scenarios
+        if this is ever composed into a larger pipeline.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         results_file = f"{self.base_output_dir}/batch_results_{timestamp}.json"
-        
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        
+
+        await asyncio.to_thread(self._dump_json, results, results_file)
+
         print(f"Batch results saved to: {results_file}")
         
         # Print summary
@@ -182,69 +362,80 @@ class BatchWaypointRunner:
         print(f"  Results file: {results_file}")
         print(f"{'='*60}")
 
+    def _dump_json(self, results: List[Dict], results_file: str):
+        """Serialize results in one pass and write them with a single call."""
+        with open(results_file, 'wb') as f:
+            f.write(_dumps(results))
+
 
-def create_waypoint_scenarios(base_scenario_file: str, map_name: str, 
+def create_waypoint_scenarios(base_scenario_file: str, map_name: str,
                             waypoint_counts: List[int]) -> None:
     """Create waypoint scenarios from a base scenario file."""
-    
+
     print(f"Creating waypoint scenarios for {map_name}...")
-    
+
     # Read base scenario
     with open(base_scenario_file, 'r') as f:
         lines = f.readlines()
-    
-    # Create scenarios directory if it doesn't exist
+
+    # Create every needed directory exactly once instead of re-stat'ing
+    # per waypoint count inside the loop
     scenarios_dir = f"data/scenarios/{map_name}"
-    os.makedirs(scenarios_dir, exist_ok=True)
-    
+    needed_dirs = {scenarios_dir} | {
+        f"{scenarios_dir}/{map_name}_{wp_count}wp" for wp_count in waypoint_counts
+    }
+    for directory in needed_dirs:
+        os.makedirs(directory, exist_ok=True)
+
+    rng = np.random.default_rng()
+
+    # Parse every scenario line (skipping the version line) into columns once;
+    # the parsed fields and waypoint bounds are shared by all waypoint counts
+    rows = [parts for parts in (line.strip().split('\t') for line in lines[1:])
+            if len(parts) >= 9]
+    # np.array([]) is 1-D, so give the empty case an explicit (0, 6) shape
+    coords = np.array([parts[2:8] for parts in rows], dtype=np.int64).reshape(-1, 6)
+    width, height, start_x, start_y, goal_x, goal_y = coords.T
+    lo_x = np.minimum(start_x, goal_x)
+    hi_x = np.maximum(start_x, goal_x)
+    lo_y = np.minimum(start_y, goal_y)
+    hi_y = np.maximum(start_y, goal_y)
+    n = len(rows)
+
     for wp_count in waypoint_counts:
         scenario_dir = f"{scenarios_dir}/{map_name}_{wp_count}wp"
-        os.makedirs(scenario_dir, exist_ok=True)
         scenario_file = f"{scenario_dir}/{map_name}-random-1.scen"
-        
+
         print(f"  Creating {wp_count}wp scenario...")
-        
+
+        # Draw all waypoints for all lines in one shot. As before, each
+        # waypoint has a 70% chance of lying in the start-goal bounding box
+        # and a 30% chance of being anywhere on the map.
+        boxed_x = rng.integers(lo_x[:, None], hi_x[:, None] + 1, size=(n, wp_count))
+        boxed_y = rng.integers(lo_y[:, None], hi_y[:, None] + 1, size=(n, wp_count))
+        anywhere_x = rng.integers(0, width[:, None], size=(n, wp_count))
+        anywhere_y = rng.integers(0, height[:, None], size=(n, wp_count))
+        in_box = rng.random((n, wp_count)) < 0.7
+        wp_x = np.where(in_box, boxed_x, anywhere_x)
+        wp_y = np.where(in_box, boxed_y, anywhere_y)
+
+        # Interleave into x y x y ... order for the output column
+        waypoints = np.empty((n, 2 * wp_count), dtype=np.int64)
+        waypoints[:, 0::2] = wp_x
+        waypoints[:, 1::2] = wp_y
+
+        # Build all output lines in memory and write the file in one call
+        out_lines = ["version 1\n"]
+        for parts, wp_row in zip(rows, waypoints.tolist()):
+            bucket, width_s, height_s = parts[0], parts[2], parts[3]
+            sx, sy, gx, gy, optimal_length = parts[4], parts[5], parts[6], parts[7], parts[8]
+            out_lines.append(f"{bucket}\t{map_name}.map\t{width_s}\t{height_s}\t"
+                             f"{sx}\t{sy}\t{gx}\t{gy}\t{optimal_length}\t"
+                             f"{wp_count}\t{' '.join(map(str, wp_row))}\n")
+
         with open(scenario_file, 'w') as f:
-            f.write("version 1\n")
-            
-            for line in lines[1:]:  # Skip version line
-                parts = line.strip().split('\t')
-                if len(parts) < 8:
-                    continue
-                
-                # Parse base scenario line
-                bucket = parts[0]
-                width = parts[2]
-                height = parts[3]
-                start_x = parts[4]
-                start_y = parts[5]
-                goal_x = parts[6]
-                goal_y = parts[7]
-                optimal_length = parts[8]
-                
-                # Generate random waypoints between start and goal
-                import random
-                waypoints = []
-                for i in range(wp_count):
-                    # Generate waypoint between start and goal
-                    # Use weighted random to prefer positions between start and goal
-                    start_x, start_y = int(start_x), int(start_y)
-                    goal_x, goal_y = int(goal_x), int(goal_y)
-                    
-                    # Generate waypoint with some preference for the middle area
-                    if random.random() < 0.7:  # 70% chance to be in middle area
-                        wp_x = random.randint(min(start_x, goal_x), max(start_x, goal_x))
-                        wp_y = random.randint(min(start_y, goal_y), max(start_y, goal_y))
-                    else:  # 30% chance to be anywhere
-                        wp_x = random.randint(0, int(width)-1)
-                        wp_y = random.randint(0, int(height)-1)
-                    
-                    waypoints.extend([str(wp_x), str(wp_y)])
-                
-                # Write waypoint scenario line
-                waypoint_line = f"{bucket}\t{map_name}.map\t{width}\t{height}\t{start_x}\t{start_y}\t{goal_x}\t{goal_y}\t{optimal_length}\t{wp_count}\t{' '.join(waypoints)}\n"
-                f.write(waypoint_line)
-        
+            f.write(''.join(out_lines))
+
         print(f"    Created: {scenario_file}")
 
 
@@ -268,6 +459,8 @@ def main():
                        help="Base scenario file for creating waypoint scenarios")
     parser.add_argument("--scenario-files", nargs="+", default=["random-1"],
                        help="List of scenario file numbers to run (e.g., random-1, random-2, etc.)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Number of worker processes (default: number of CPUs)")
     
     args = parser.parse_args()
     
@@ -290,7 +483,8 @@ def main():
         scenario_files=args.scenario_files,
         num_agents=args.agents,
         timeout=args.timeout,
-        suboptimality=args.suboptimality
+        suboptimality=args.suboptimality,
+        workers=args.workers
     )
     
     return results
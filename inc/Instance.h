@@ -13,9 +13,11 @@ public:
 	// enum valid_moves_t { NORTH, EAST, SOUTH, WEST, WAIT_MOVE, MOVE_COUNT };  // MOVE_COUNT is the enum's size
 
 	Instance(){}
-	Instance(const string& map_fname, const string& agent_fname, 
+	Instance(const string& map_fname, const string& agent_fname,
 		int num_of_agents = 0, int num_of_rows = 0, int num_of_cols = 0, int num_of_obstacles = 0, int warehouse_width = 0);
 
+	// reload the agents from a new file, keeping the already-parsed map
+	bool resetAgents(const string& agent_fname, int num_of_agents);
 
 	void printAgents() const;
 
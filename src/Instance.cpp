@@ -340,6 +340,14 @@ void Instance::saveMap() const
 }
 
 
+bool Instance::resetAgents(const string& agent_fname, int num_of_agents)
+{
+	this->agent_fname = agent_fname;
+	this->num_of_agents = num_of_agents;
+	return loadAgents();
+}
+
+
 bool Instance::loadAgents()
 {
 	using namespace std;
@@ -9,6 +9,8 @@
 */
 #include <boost/program_options.hpp>
 #include <boost/tokenizer.hpp>
+#include <memory>
+#include <sstream>
 #include "ECBS.h"
 
 
@@ -47,6 +49,10 @@ int main(int argc, char** argv)
 		("targetReasoning", po::value<bool>()->default_value(true), "target reasoning")
 		("sipp", po::value<bool>()->default_value(0), "using SIPPS as the low-level solver")
 		("restart", po::value<int>()->default_value(0), "rapid random restart times")
+
+		// params for the persistent worker mode
+		("server", "run as a persistent worker: parse the map once, then solve one request "
+			"per stdin line of the form '<agents_file> <agent_num> <paths_file|-> <stats_file|->'")
 		;
 	po::variables_map vm;
 	po::store(po::parse_command_line(argc, argv, desc), vm);
@@ -130,6 +136,72 @@ int main(int argc, char** argv)
 
 	srand((int)time(0));
 
+	///////////////////////////////////////////////////////////////////////////
+	// persistent worker mode: amortize process startup and map parsing over
+	// many solves (e.g. the per-segment calls made by waypoint_eecbs.py)
+	if (vm.count("server"))
+	{
+		if (!vm["lowLevelSolver"].as<bool>())
+		{
+			cerr << "Server mode only supports the suboptimal low-level solver!" << endl;
+			return -1;
+		}
+		std::unique_ptr<Instance> instance;
+		string request;
+		while (getline(std::cin, request))
+		{
+			if (request.empty())
+				continue;
+			std::istringstream iss(request);
+			string agent_fname, paths_fname, stats_fname;
+			int agent_num;
+			if (!(iss >> agent_fname >> agent_num >> paths_fname >> stats_fname))
+			{
+				// every request must end with the OK terminator, or the
+				// client would block waiting for it
+				cout << "Error,bad request: " << request << endl;
+				cout << "OK" << endl;
+				continue;
+			}
+			// the map is parsed once, on the first request; later requests
+			// only reload the agents
+			if (instance == nullptr)
+				instance.reset(new Instance(vm["map"].as<string>(), agent_fname, agent_num));
+			else if (!instance->resetAgents(agent_fname, agent_num))
+			{
+				cout << "Error,failed to load agents from " << agent_fname << endl;
+				cout << "OK" << endl;
+				continue;
+			}
+			srand(0);
+			ECBS ecbs(*instance, vm["sipp"].as<bool>(), vm["screen"].as<int>());
+			ecbs.setPrioritizeConflicts(vm["prioritizingConflicts"].as<bool>());
+			ecbs.setDisjointSplitting(vm["disjointSplitting"].as<bool>());
+			ecbs.setBypass(vm["bypass"].as<bool>());
+			ecbs.setRectangleReasoning(vm["rectangleReasoning"].as<bool>());
+			ecbs.setCorridorReasoning(vm["corridorReasoning"].as<bool>());
+			ecbs.setHeuristicType(h, h_hat);
+			ecbs.setTargetReasoning(vm["targetReasoning"].as<bool>());
+			ecbs.setMutexReasoning(false);
+			ecbs.setConflictSelectionRule(conflict);
+			ecbs.setNodeSelectionRule(n);
+			ecbs.setSavingStats(vm["stats"].as<bool>());
+			ecbs.setHighLevelSolver(s, vm["suboptimality"].as<double>());
+			int lowerbound = 0;
+			ecbs.clear();
+			ecbs.solve(vm["cutoffTime"].as<double>(), lowerbound);
+			if (stats_fname != "-")
+				ecbs.saveResults(stats_fname, agent_fname);
+			if (ecbs.solution_found && paths_fname != "-")
+				ecbs.savePaths(paths_fname);
+			ecbs.clearSearchEngines();
+			// acknowledge only after the output files are fully written, so
+			// the client never reads a partially written paths file
+			cout << "OK" << endl;
+		}
+		return 0;
+	}
+
 	///////////////////////////////////////////////////////////////////////////
 	// load the instance
 	Instance instance(vm["map"].as<string>(), vm["agents"].as<string>(),
@@ -13,14 +13,24 @@ Example:
 """
 
 import argparse
+import functools
+import logging
 import os
 import subprocess
 import tempfile
-import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Dict, Optional
 import csv
 import json
 
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Per-segment scratch files are written and read back immediately, so keep
+# them on tmpfs when the platform provides one instead of hitting disk
+_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
 
 class WaypointScenarioParser:
     """Parser for scenario files with waypoints."""
@@ -30,22 +40,28 @@ class WaypointScenarioParser:
         self.scenarios = self._parse_scenarios()
     
     def _parse_scenarios(self) -> List[Dict]:
-        """Parse the scenario file and extract waypoint information."""
-        scenarios = []
-        
-        with open(self.scenario_file, 'r') as f:
-            lines = f.readlines()
-        
-        # Skip version line
-        for line in lines[1:]:
-            line = line.strip()
-            if not line:
-                continue
-                
-            parts = line.split('\t')
+        """Parse the scenario file (cached across parsers by path and mtime)."""
+        return _parse_scenarios_cached(self.scenario_file,
+                                       os.stat(self.scenario_file).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_scenarios_cached(scenario_file: str, mtime_ns: int) -> List[Dict]:
+    """Parse a scenario file and extract waypoint information.
+
+    Repeated runner calls parse the same .scen file once per process; the
+    mtime argument invalidates the cache if the file is rewritten.
+    """
+    scenarios = []
+
+    with open(scenario_file, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter='\t')
+        next(reader, None)  # skip version line
+
+        for parts in reader:
             if len(parts) < 10:
                 continue
-            
+
             # Parse scenario line
             # Format: bucket map width height start_x start_y goal_x goal_y optimal_length num_waypoints waypoint1_x waypoint1_y waypoint2_x waypoint2_y ...
             try:
@@ -59,19 +75,22 @@ class WaypointScenarioParser:
                 goal_y = int(parts[7])
                 optimal_length = float(parts[8])
                 num_waypoints = int(parts[9])  # This is number of waypoints, not agents
-                
-                # Extract waypoints (tab-separated coordinates starting from index 10)
-                waypoints = []
-                if len(parts) > 10:
-                    # Waypoint coordinates start at index 10 and are tab-separated
-                    # Each waypoint has 2 coordinates (x, y)
-                    for i in range(num_waypoints):
-                        wp_idx = 10 + (i * 2)
-                        if wp_idx + 1 < len(parts):
-                            wp_x = int(parts[wp_idx])
-                            wp_y = int(parts[wp_idx + 1])
-                            waypoints.append((wp_x, wp_y))
-                
+            
+                # Extract waypoints, converting the whole row in one numpy
+                # call instead of per-value int(). Benchmark files carry them
+                # as tab-separated fields from index 10; files from our own
+                # --create-scenarios generator pack them space-joined into a
+                # single field
+                if num_waypoints and len(parts) == 11:
+                    coords = parts[10].split()
+                else:
+                    coords = parts[10:10 + 2 * num_waypoints]
+                if coords:
+                    arr = np.array(coords, dtype=np.int64).reshape(-1, 2)
+                    waypoints = list(map(tuple, arr.tolist()))
+                else:
+                    waypoints = []
+            
                 # The goal is already given in columns 6-7, not the last waypoint
                 scenarios.append({
                     'bucket': bucket,
@@ -84,13 +103,13 @@ class WaypointScenarioParser:
                     'num_waypoints': num_waypoints,
                     'waypoints': waypoints
                 })
-                
+            
             except (ValueError, IndexError) as e:
-                print(f"Warning: Could not parse line: {line.strip()}")
-                print(f"Error: {e}")
+                log.warning("Could not parse line: %s", '\t'.join(parts))
+                log.warning("Error: %s", e)
                 continue
-        
-        return scenarios
+    
+    return scenarios
 
 
 class WaypointEECBSRunner:
@@ -99,18 +118,73 @@ class WaypointEECBSRunner:
     def __init__(self, eecbs_executable: str = "./eecbs"):
         self.eecbs_executable = eecbs_executable
         self.temp_files = []
-    
+
+        # Persistent EECBS worker (--server mode): one long-lived process per
+        # (map, timeout, suboptimality) that parses the map once and then
+        # solves one segment per request, avoiding a fork+exec per segment
+        self._server_proc = None
+        self._server_key = None
+        self._server_broken = False
+
     def __del__(self):
-        """Clean up temporary files."""
+        """Clean up the worker process and temporary files."""
+        self._stop_server()
         for temp_file in self.temp_files:
             try:
                 os.remove(temp_file)
             except:
                 pass
+
+    def _stop_server(self):
+        """Terminate the persistent EECBS worker if one is running."""
+        if self._server_proc is not None:
+            try:
+                self._server_proc.stdin.close()
+                self._server_proc.terminate()
+                self._server_proc.wait(timeout=5)
+            except Exception:
+                pass
+            self._server_proc = None
+            self._server_key = None
+
+    def _ensure_server(self, map_file: str, timeout: int, suboptimality: float):
+        """Return a persistent EECBS worker for these settings, or None.
+
+        The worker is started lazily and reused as long as the map and solver
+        settings stay the same; None means the executable does not support
+        --server mode (or died), in which case callers fall back to one-shot
+        subprocess.run invocations.
+        """
+        if self._server_broken:
+            return None
+
+        key = (map_file, timeout, suboptimality)
+        if self._server_proc is not None:
+            if self._server_key == key and self._server_proc.poll() is None:
+                return self._server_proc
+            self._stop_server()
+
+        try:
+            self._server_proc = subprocess.Popen(
+                [self.eecbs_executable, '--server',
+                 '-m', map_file,
+                 '-a', '-',  # required by the CLI; server requests carry the real file
+                 '-t', str(timeout),
+                 '--suboptimality', str(suboptimality)],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                text=True, bufsize=1)
+            self._server_key = key
+        except OSError as e:
+            log.warning("Could not start the persistent EECBS worker (%s); "
+                        "falling back to one-shot runs", e)
+            self._server_broken = True
+            self._server_proc = None
+
+        return self._server_proc
     
     def _create_temp_scenario(self, start: Tuple[int, int], goal: Tuple[int, int]) -> str:
         """Create a temporary scenario file for a single start-goal pair."""
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.scen', delete=False)
+        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.scen', delete=False, dir=_TEMP_DIR)
         temp_file.write("version 1\n")
         temp_file.write(f"0\tmap.map\t8\t8\t{start[0]}\t{start[1]}\t{goal[0]}\t{goal[1]}\t0.0\n")
         temp_file.close()
@@ -132,45 +206,100 @@ class WaypointEECBSRunner:
         Returns:
             Path to the temporary scenario file
         """
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.scen', delete=False)
-        temp_file.write("version 1\n")
-        
-        for bucket, (start, goal) in enumerate(agent_pairs):
-            temp_file.write(f"{bucket}\t{map_name}\t{width}\t{height}\t{start[0]}\t{start[1]}\t{goal[0]}\t{goal[1]}\t0\n")
-        
+        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.scen', delete=False, dir=_TEMP_DIR)
+
+        # Build the whole payload first and emit it with a single write
+        lines = ["version 1\n"]
+        lines.extend(f"{bucket}\t{map_name}\t{width}\t{height}\t{start[0]}\t{start[1]}\t{goal[0]}\t{goal[1]}\t0\n"
+                     for bucket, (start, goal) in enumerate(agent_pairs))
+        temp_file.write("".join(lines))
+
         temp_file.close()
         self.temp_files.append(temp_file.name)
         return temp_file.name
     
-    def _run_eecbs(self, map_file: str, scenario_file: str, num_agents: int = 1, 
-                   timeout: int = 60, suboptimality: float = 1.2, 
+    def _run_eecbs(self, map_file: str, scenario_file: str, num_agents: int = 1,
+                   timeout: int = 60, suboptimality: float = 1.2,
                    output_stats: str = None, output_paths: str = None) -> Dict:
-        """Run EECBS for a single start-goal pair."""
-        
-        cmd = [
-            self.eecbs_executable,
-            '-m', map_file,
-            '-a', scenario_file,
-            '-k', str(num_agents),
-            '-t', str(timeout),
-            '--suboptimality', str(suboptimality)
-        ]
-        
-        if output_stats:
-            cmd.extend(['-o', output_stats])
-        if output_paths:
-            cmd.extend(['--outputPaths', output_paths])
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout + 10)
-            
+        """Run EECBS for a single segment, preferring the persistent worker."""
+
+        stdout = stderr = ''
+        result_line = None
+
+        server = self._ensure_server(map_file, timeout, suboptimality)
+        if server is not None:
+            request = (f"{scenario_file} {num_agents} "
+                       f"{output_paths or '-'} {output_stats or '-'}\n")
+            try:
+                server.stdin.write(request)
+                server.stdin.flush()
+                # The worker prints the solver's summary line(s) followed by
+                # an OK acknowledgement once the output files are on disk
+                lines = []
+                while True:
+                    line = server.stdout.readline()
+                    if not line:
+                        lines = []
+                        break
+                    line = line.strip()
+                    if line == 'OK':
+                        break
+                    lines.append(line)
+                result_line = lines[-1] if lines else None
+            except TimeoutError:
+                # the scenario-level SIGALRM must keep aborting the run, not
+                # get swallowed as an OSError here
+                raise
+            except (BrokenPipeError, OSError, ValueError):
+                result_line = None
+            if not result_line:
+                # The executable predates --server mode (or the worker died);
+                # fall back to one-shot runs for the rest of this process
+                log.warning("EECBS worker unavailable (executable without "
+                            "--server support?); falling back to one-shot "
+                            "runs. Rebuild eecbs to enable the persistent "
+                            "worker.")
+                self._stop_server()
+                self._server_broken = True
+                result_line = None
+            else:
+                stdout = result_line
+
+        if result_line is None:
+            cmd = [
+                self.eecbs_executable,
+                '-m', map_file,
+                '-a', scenario_file,
+                '-k', str(num_agents),
+                '-t', str(timeout),
+                '--suboptimality', str(suboptimality)
+            ]
+
+            if output_stats:
+                cmd.extend(['-o', output_stats])
+            if output_paths:
+                cmd.extend(['--outputPaths', output_paths])
+
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout + 10)
+            except subprocess.TimeoutExpired:
+                return {
+                    'success': False,
+                    'error': f"EECBS timed out after {timeout} seconds"
+                }
+            except Exception as e:
+                return {
+                    'success': False,
+                    'error': f"Error running EECBS: {str(e)}"
+                }
+
             if result.returncode != 0:
                 return {
                     'success': False,
                     'error': f"EECBS failed with return code {result.returncode}",
                     'stderr': result.stderr
                 }
-            
+
             # Parse the output
             output_lines = result.stdout.strip().split('\n')
             if not output_lines:
@@ -178,71 +307,60 @@ class WaypointEECBSRunner:
                     'success': False,
                     'error': "No output from EECBS"
                 }
-            
-            # Parse the result line (e.g., "WDG+R+C+T+BP with AStar : Succeed,6,2.1e-05,0,7,6,6,6,")
+
             result_line = output_lines[-1]
-            if 'Succeed' not in result_line:
-                return {
-                    'success': False,
-                    'error': f"EECBS did not succeed: {result_line}"
-                }
-            
-            # Extract cost from the result
-            parts = result_line.split(',')
-            if len(parts) >= 5:
-                cost = int(parts[4])
-            else:
-                cost = None
-            
-            return {
-                'success': True,
-                'cost': cost,
-                'output': result_line,
-                'stdout': result.stdout,
-                'stderr': result.stderr
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': f"EECBS timed out after {timeout} seconds"
-            }
-        except Exception as e:
+            stdout = result.stdout
+            stderr = result.stderr
+
+        # Parse the result line (e.g., "WDG+R+C+T+BP with AStar : Succeed,6,2.1e-05,0,7,6,6,6,")
+        if 'Succeed' not in result_line:
             return {
                 'success': False,
-                'error': f"Error running EECBS: {str(e)}"
+                'error': f"EECBS did not succeed: {result_line}"
             }
+
+        # Extract cost from the result; only the fifth field is needed, so
+        # cap the split instead of tokenizing the whole line
+        try:
+            cost = int(result_line.split(',', 5)[4])
+        except (IndexError, ValueError):
+            cost = None
+
+        return {
+            'success': True,
+            'cost': cost,
+            'output': result_line,
+            'stdout': stdout,
+            'stderr': stderr
+        }
     
     def _parse_paths_file(self, paths_file: str) -> List[List[Tuple[int, int]]]:
         """Parse the paths output file from EECBS."""
         paths = []
         
         try:
+            # Lines look like "Agent 0: (1,0)->(2,0)->(2,1)->(2,2)->(3,2)->"
             with open(paths_file, 'r') as f:
-                content = f.read().strip()
-                
-            # Parse paths like "Agent 0: (1,0)->(2,0)->(2,1)->(2,2)->(3,2)->(3,3)->(3,4)->"
-            agent_pattern = r'Agent (\d+): (.+?)(?=Agent \d+:|$)'
-            coordinate_pattern = r'\((\d+),(\d+)\)'
-            
-            for match in re.finditer(agent_pattern, content, re.DOTALL):
-                agent_id = int(match.group(1))
-                path_str = match.group(2).strip()
-                
-                # Extract coordinates
-                coordinates = []
-                for coord_match in re.finditer(coordinate_pattern, path_str):
-                    x = int(coord_match.group(1))
-                    y = int(coord_match.group(2))
-                    coordinates.append((x, y))
-                
-                # Ensure we have a path for this agent
-                while len(paths) <= agent_id:
-                    paths.append([])
-                paths[agent_id] = coordinates
+                for line in f:
+                    if not line.startswith('Agent '):
+                        continue
+                    head, _, path_str = line.partition(': ')
+                    agent_id = int(head[6:])
+
+                    coordinates = []
+                    for token in path_str.strip().split('->'):
+                        if not token:
+                            continue
+                        x, _, y = token[1:-1].partition(',')
+                        coordinates.append((int(x), int(y)))
+
+                    # Ensure we have a path for this agent
+                    while len(paths) <= agent_id:
+                        paths.append([])
+                    paths[agent_id] = coordinates
                 
         except Exception as e:
-            print(f"Warning: Could not parse paths file: {e}")
+            log.warning("Could not parse paths file: %s", e)
         
         return paths
     
@@ -299,19 +417,22 @@ class WaypointEECBSRunner:
                 'error': f"Not enough agents: need {num_agents}, have {len(agents)}"
             }
         
-        print(f"Running scenario {scenario_index} with {num_agents} agents:")
-        for i, agent in enumerate(agents):
-            print(f"  Agent {i}: Start at {agent['start']}, visit waypoints {agent['waypoints']}, end at {agent['goal']}")
-            print(f"    Number of waypoints: {agent['num_waypoints']}")
+        if log.isEnabledFor(logging.INFO):
+            log.info(f"Running scenario {scenario_index} with {num_agents} agents:")
+            for i, agent in enumerate(agents):
+                log.info(f"  Agent {i}: Start at {agent['start']}, visit waypoints {agent['waypoints']}, end at {agent['goal']}")
+                log.info(f"    Number of waypoints: {agent['num_waypoints']}")
         
         # Each agent's sequence: start -> wp1 -> ... -> wpN -> goal
         seqs = []
         for i, agent in enumerate(agents):
             sequence = [agent['start']] + agent['waypoints'] + [agent['goal']]
             seqs.append(sequence)
-            print(f"  Agent {i} complete sequence: {' -> '.join([f'({x},{y})' for x, y in sequence])}")
+            if log.isEnabledFor(logging.INFO):
+                log.info(f"  Agent {i} complete sequence: {' -> '.join([f'({x},{y})' for x, y in sequence])}")
         
-        print(f"\nTotal waypoint sequence length: {[len(seq) - 1 for seq in seqs]} segments per agent")
+        if log.isEnabledFor(logging.INFO):
+            log.info(f"\nTotal waypoint sequence length: {[len(seq) - 1 for seq in seqs]} segments per agent")
         
         num_segments = max(len(seq) - 1 for seq in seqs)
         map_name = agents[0]['map_name']
@@ -319,14 +440,12 @@ class WaypointEECBSRunner:
         height = agents[0]['height']
         
         # Build the complete path through waypoints
-        complete_paths = [[] for _ in range(num_agents)]
+        all_segment_paths = []
         total_cost = 0
         segment_results = []
         
         for seg in range(num_segments):
-            print(f"\n{'='*50}")
-            print(f"SEGMENT {seg+1} of {num_segments}")
-            print(f"{'='*50}")
+            log.info("\n%s\nSEGMENT %d of %d\n%s", '=' * 50, seg + 1, num_segments, '=' * 50)
             
             # For this segment, gather each agent's (start, end)
             agent_pairs = []
@@ -336,52 +455,78 @@ class WaypointEECBSRunner:
                     end_point = seq[seg + 1]
                     agent_pairs.append((start_point, end_point))
                     if seg == 0:
-                        print(f"  Agent {agent_idx}: START -> WP1: {start_point} -> {end_point}")
+                        log.info("  Agent %d: START -> WP1: %s -> %s", agent_idx, start_point, end_point)
                     elif seg == len(seq) - 2:
-                        print(f"  Agent {agent_idx}: WP{seg} -> GOAL: {start_point} -> {end_point}")
+                        log.info("  Agent %d: WP%d -> GOAL: %s -> %s", agent_idx, seg, start_point, end_point)
                     else:
-                        print(f"  Agent {agent_idx}: WP{seg} -> WP{seg+1}: {start_point} -> {end_point}")
+                        log.info("  Agent %d: WP%d -> WP%d: %s -> %s", agent_idx, seg, seg + 1, start_point, end_point)
                 else:
                     # Agent already at its final goal; keep it stationary
                     final_pos = seq[-1]
                     agent_pairs.append((final_pos, final_pos))
-                    print(f"  Agent {agent_idx}: STATIONARY at GOAL: {final_pos} -> {final_pos}")
-            
-            print(f"\nCalling EECBS for segment {seg+1} with {len(agent_pairs)} agents...")
+                    log.info("  Agent %d: STATIONARY at GOAL: %s -> %s", agent_idx, final_pos, final_pos)
             
+            # If every agent just waits in place this segment, the solution
+            # is trivial; synthesize it instead of paying for an EECBS run.
+            # EECBS paths files use (row, col) order, i.e. the scenario's
+            # (x, y) swapped, so emit the positions the same way
+            if all(start == goal for start, goal in agent_pairs):
+                segment_paths = [[(y, x)] for (x, y), _ in agent_pairs]
+                segment_results.append({
+                    'segment': seg + 1,
+                    'agent_pairs': agent_pairs,
+                    'cost': 0,
+                    'paths': segment_paths,
+                    'eecbs_output': 'all agents stationary, EECBS skipped'
+                })
+                log.info("  Cost: 0 (all agents stationary, EECBS skipped)")
+                all_segment_paths.append(segment_paths)
+                continue
+
+            log.info("\nCalling EECBS for segment %d with %d agents...", seg + 1, len(agent_pairs))
+
             # Create temporary scenario file for this segment with all agents
             temp_scenario = self._create_temp_scenario_multi(map_name, width, height, agent_pairs)
             
             # Create temporary output files
-            temp_stats = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-            temp_paths = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
+            temp_stats = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, dir=_TEMP_DIR)
+            temp_paths = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, dir=_TEMP_DIR)
             temp_stats.close()
             temp_paths.close()
             
-            self.temp_files.extend([temp_stats.name, temp_paths.name])
-            
-            # Run EECBS for this segment with all agents
-            print(f"DEBUG: Starting EECBS run for segment {seg+1}...")
-            result = self._run_eecbs(
-                map_file=map_file,
-                scenario_file=temp_scenario,
-                num_agents=num_agents,
-                timeout=timeout,
-                suboptimality=suboptimality,
-                output_stats=temp_stats.name,
-                output_paths=temp_paths.name
-            )
-            print(f"DEBUG: EECBS run completed for segment {seg+1}")
-            
-            if not result['success']:
-                return {
-                    'success': False,
-                    'error': f"Segment {seg+1} failed: {result['error']}"
-                }
-            
-            # Parse the paths for this segment
-            segment_paths = self._parse_paths_file(temp_paths.name)
-            
+            try:
+                # Run EECBS for this segment with all agents
+                log.debug("Starting EECBS run for segment %d...", seg + 1)
+                result = self._run_eecbs(
+                    map_file=map_file,
+                    scenario_file=temp_scenario,
+                    num_agents=num_agents,
+                    timeout=timeout,
+                    suboptimality=suboptimality,
+                    output_stats=temp_stats.name,
+                    output_paths=temp_paths.name
+                )
+                log.debug("EECBS run completed for segment %d", seg + 1)
+
+                if not result['success']:
+                    return {
+                        'success': False,
+                        'error': f"Segment {seg+1} failed: {result['error']}"
+                    }
+
+                # Parse the paths for this segment
+                segment_paths = self._parse_paths_file(temp_paths.name)
+            finally:
+                # Scratch files are fully consumed by now; unlink them here
+                # instead of letting them pile up until __del__
+                for path in (temp_scenario, temp_stats.name, temp_paths.name):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                if temp_scenario in self.temp_files:
+                    self.temp_files.remove(temp_scenario)
+
             # Store segment result
             segment_results.append({
                 'segment': seg + 1,
@@ -392,21 +537,32 @@ class WaypointEECBSRunner:
             })
             
             total_cost += result['cost'] if result['cost'] else 0
-            print(f"  Cost: {result['cost']}")
-            
-            # Stitch paths; skip first coordinate of each segment to avoid duplicates
-            for agent_id in range(num_agents):
+            log.info("  Cost: %s", result['cost'])
+
+            all_segment_paths.append(segment_paths)
+
+        # Stitch paths; skip the first coordinate of each later segment to
+        # avoid duplicating the join point. Pre-size each agent's list and
+        # fill it by slice assignment instead of growing it segment by segment
+        complete_paths = []
+        for agent_id in range(num_agents):
+            chunks = []
+            for seg, segment_paths in enumerate(all_segment_paths):
                 path = segment_paths[agent_id] if agent_id < len(segment_paths) else []
                 if seg == 0:
-                    # First segment: include all coordinates
-                    complete_paths[agent_id] = path[:]
+                    chunks.append(path)
+                elif len(path) > 1:
+                    chunks.append(path[1:])
                 else:
-                    # Subsequent segments: append coordinates starting from index 1
-                    if len(path) > 1:
-                        complete_paths[agent_id].extend(path[1:])
-                    else:
-                        complete_paths[agent_id].append(path[0])
-        
+                    # Stationary segment: repeat the position as a wait step
+                    chunks.append(path[:1])
+            stitched = [None] * sum(len(chunk) for chunk in chunks)
+            cursor = 0
+            for chunk in chunks:
+                stitched[cursor:cursor + len(chunk)] = chunk
+                cursor += len(chunk)
+            complete_paths.append(stitched)
+
         # Create final output
         final_result = {
             'success': True,
@@ -433,9 +589,8 @@ class WaypointEECBSRunner:
             # Save detailed results as JSON
             json_file = os.path.join(output_dir, f"waypoint_results_{scenario_index}.json")
             with open(json_file, 'w') as f:
-                # Convert tuples to lists for JSON serialization
-                json_result = json.loads(json.dumps(final_result, default=lambda x: list(x) if isinstance(x, tuple) else x))
-                json.dump(json_result, f, indent=2)
+                # json serializes tuples as lists natively, so one pass is enough
+                json.dump(final_result, f, indent=2)
             
             print(f"\nResults saved to:")
             print(f"  Paths: {paths_file}")
@@ -444,12 +599,48 @@ class WaypointEECBSRunner:
         return final_result
 
 
+# One runner per pool process, created by the initializer below, so every
+# job in the same process reuses the same persistent EECBS worker
+_JOB_RUNNER = None
+
+
+def _init_scenario_worker(eecbs_executable):
+    global _JOB_RUNNER
+    _JOB_RUNNER = WaypointEECBSRunner(eecbs_executable)
+
+
+def _run_scenario_job(job):
+    """Solve one scenario index in a worker process (module-level so it pickles)."""
+    (map_file, scenario_file, scenario_index,
+     num_agents, timeout, suboptimality, output_dir) = job
+    runner = _JOB_RUNNER
+    try:
+        result = runner.run_waypoint_scenario(
+            map_file=map_file,
+            scenario_file=scenario_file,
+            scenario_index=scenario_index,
+            num_agents=num_agents,
+            timeout=timeout,
+            suboptimality=suboptimality,
+            output_dir=output_dir
+        )
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+    result['scenario_index'] = scenario_index
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run EECBS for multiple waypoints')
     parser.add_argument('map_file', help='Path to the map file')
     parser.add_argument('scenario_file', help='Path to the scenario file with waypoints')
-    parser.add_argument('-s', '--scenario', type=int, default=0, 
+    parser.add_argument('-s', '--scenario', type=int, default=0,
                        help='Scenario index to run (default: 0)')
+    parser.add_argument('--scenario-start', type=int, default=None,
+                       help='First scenario index for batch mode (default: 0)')
+    parser.add_argument('--scenario-end', type=int, default=None,
+                       help='One past the last scenario index for batch mode '
+                            '(default: number of scenarios in the file)')
     parser.add_argument('-k', '--agents', type=int, default=1,
                        help='Number of agents (default: 1)')
     parser.add_argument('-t', '--timeout', type=int, default=60,
@@ -459,26 +650,61 @@ def main():
     parser.add_argument('-o', '--output', help='Output directory for results')
     parser.add_argument('--eecbs', default='./eecbs',
                        help='Path to EECBS executable (default: ./eecbs)')
-    
+    parser.add_argument('-v', '--verbose', action='store_true',
+                       help='Print per-segment progress (default: summary only)')
+
     args = parser.parse_args()
+
+    # Per-segment chatter goes through the logging module so non-verbose
+    # runs skip the formatting and write syscalls entirely
+    logging.basicConfig(format='%(message)s',
+                        level=logging.INFO if args.verbose else logging.WARNING)
     
-    # Check if files exist
-    if not os.path.exists(args.map_file):
-        print(f"Error: Map file '{args.map_file}' not found")
-        return 1
-    
-    if not os.path.exists(args.scenario_file):
-        print(f"Error: Scenario file '{args.scenario_file}' not found")
-        return 1
-    
-    if not os.path.exists(args.eecbs):
-        print(f"Error: EECBS executable '{args.eecbs}' not found")
-        print("Make sure to build EECBS first with: cmake . && make")
-        return 1
-    
+    # Check if files exist; os.stat distinguishes missing files from
+    # permission problems, which os.path.exists silently conflates
+    for path, label in [(args.map_file, 'Map file'),
+                        (args.scenario_file, 'Scenario file'),
+                        (args.eecbs, 'EECBS executable')]:
+        try:
+            os.stat(path)
+        except FileNotFoundError:
+            print(f"Error: {label} '{path}' not found")
+            if label == 'EECBS executable':
+                print("Make sure to build EECBS first with: cmake . && make")
+            return 1
+        except OSError as e:
+            print(f"Error: cannot access {label} '{path}': {e}")
+            return 1
+
+    # Batch mode: solve a range of scenario indices in parallel, one
+    # runner (and hence one persistent EECBS worker) per process
+    if args.scenario_start is not None or args.scenario_end is not None:
+        start = args.scenario_start if args.scenario_start is not None else 0
+        if args.scenario_end is not None:
+            end = args.scenario_end
+        else:
+            end = len(WaypointScenarioParser(args.scenario_file).scenarios)
+
+        jobs = [(args.map_file, args.scenario_file, idx,
+                 args.agents, args.timeout, args.suboptimality, args.output)
+                for idx in range(start, end)]
+        failures = 0
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 initializer=_init_scenario_worker,
+                                 initargs=(args.eecbs,)) as executor:
+            for result in executor.map(_run_scenario_job, jobs):
+                idx = result['scenario_index']
+                if result['success']:
+                    print(f"✅ Scenario {idx}: total cost {result['total_cost']}")
+                else:
+                    failures += 1
+                    print(f"❌ Scenario {idx}: {result['error']}")
+        print(f"\nBatch complete: {len(jobs) - failures}/{len(jobs)} scenarios succeeded")
+        return 1 if failures else 0
+
     # Run the waypoint scenario
     runner = WaypointEECBSRunner(args.eecbs)
-    
+
     try:
         result = runner.run_waypoint_scenario(
             map_file=args.map_file,